@@ -4,54 +4,38 @@
 # Author : Sepand KASHANI [sep@zurich.ibm.com]
 # #############################################################################
 
-import configparser
 import datetime
+import email.message
+import email.parser
 import pathlib
-import re
-from typing import Mapping
 
 
-def setup_config() -> configparser.ConfigParser:
+def pkg_info() -> email.message.Message:
     """
-    Load information contained in `setup.cfg`.
-    """
-    sphinx_src_dir = pathlib.Path(__file__).parent
-    setup_path = sphinx_src_dir / '..' / 'setup.cfg'
-    setup_path = setup_path.resolve(strict=True)
-
-    with setup_path.open(mode='r') as f:
-        cfg = configparser.ConfigParser()
-        cfg.read_file(f)
-    return cfg
+    Load package metadata contained in `PKG-INFO`.
 
-
-def pkg_info() -> Mapping:
-    """
-    Load information contained in `PKG-INFO`.
+    Returns
+    -------
+    info : :py:class:`email.message.Message`
+        PKG-INFO headers, indexable by field name (ex: ``info['Version']``).
     """
     sphinx_src_dir = pathlib.Path(__file__).parent
     info_path = sphinx_src_dir / '..' / 'pypeline.egg-info' / 'PKG-INFO'
     info_path = info_path.resolve(strict=True)
 
-    # Pattern definitions
-    pat_version = r'Version: (.+)$'
-
+    # PKG-INFO uses RFC 822 headers: no need to parse the long description.
     with info_path.open(mode='r') as f:
-        info = dict(version=None)
-        for line in f:
-            m = re.match(pat_version, line)
-            if m is not None:
-                info['version'] = m.group(1)
+        info = email.parser.Parser().parse(f, headersonly=True)
     return info
 
 
 # -- Project information -----------------------------------------------------
-cfg, info = setup_config(), pkg_info()
-project = cfg.get('metadata', 'name')
+info = pkg_info()
+project = info['Name']
 copyright = (f'{datetime.date.today().year}, '
              'Imaging of Things Team (ImoT), IBM Research Zurich')
-author = cfg.get('metadata', 'author')
-version = release = info['version']
+author = info['Author']
+version = release = info['Version']
 
 # -- General configuration ---------------------------------------------------
 extensions = [
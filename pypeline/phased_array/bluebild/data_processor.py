@@ -8,7 +8,10 @@
 Data processors.
 """
 
+import concurrent.futures as futures
+
 import numpy as np
+import scipy.linalg as linalg
 
 import pypeline.core as core
 import pypeline.phased_array.util.data_gen.visibility as vis
@@ -17,6 +20,29 @@ import pypeline.util.argcheck as chk
 import pypeline.util.math.linalg as pylinalg
 
 
+def _precision_dtypes(precision):
+    """
+    Parameters
+    ----------
+    precision : int
+        Numerical accuracy of floating-point operations: 32 or 64.
+
+    Returns
+    -------
+    fp : :py:class:`~numpy.dtype`
+        Real-valued type.
+
+    cp : :py:class:`~numpy.dtype`
+        Complex-valued type.
+    """
+    if precision == 32:
+        return np.float32, np.complex64
+    elif precision == 64:
+        return np.float64, np.complex128
+    else:
+        raise ValueError('Parameter[precision] must be 32 or 64.')
+
+
 class DataProcessorBlock(core.Block):
     """
     Top-level public interface of Bluebild data processors.
@@ -48,8 +74,9 @@ class IntensityFieldDataProcessorBlock(DataProcessorBlock):
     """
 
     @chk.check(dict(N_eig=chk.is_integer,
-                    cluster_centroids=chk.has_reals))
-    def __init__(self, N_eig, cluster_centroids):
+                    cluster_centroids=chk.has_reals,
+                    precision=chk.is_integer))
+    def __init__(self, N_eig, cluster_centroids, precision=64):
         """
         Parameters
         ----------
@@ -57,18 +84,33 @@ class IntensityFieldDataProcessorBlock(DataProcessorBlock):
             Number of eigenpairs to output after PCA decomposition.
         cluster_centroids : array-like(float)
             Intensity centroids for energy-level clustering.
+        precision : int
+            Numerical accuracy of the eigendecomposition.
+
+            Must be 32 or 64.
+            Outputs are always returned in double precision.
 
         Notes
         -----
-        Both parameters should preferably be set by calling the :py:meth:`~pypeline.phased_array.bluebild.parameter_estimator.IntensityFieldParameterEstimator.infer_parameters` method from :py:class:`~pypeline.phased_array.bluebild.parameter_estimator.IntensityFieldParameterEstimator`.
+        `N_eig` and `cluster_centroids` should preferably be set by calling the :py:meth:`~pypeline.phased_array.bluebild.parameter_estimator.IntensityFieldParameterEstimator.infer_parameters` method from :py:class:`~pypeline.phased_array.bluebild.parameter_estimator.IntensityFieldParameterEstimator`.
         """
         if N_eig <= 0:
             raise ValueError('Parameter[N_eig] must be positive.')
 
         super().__init__()
+        self._fp, self._cp = _precision_dtypes(precision)
         self._N_eig = N_eig
         self._cluster_centroids = np.array(cluster_centroids, dtype=float)
 
+        # Sorted centroids for O(log N_centroid) nearest-centroid lookups.
+        # Equal-valued centroids map to the smallest original index to agree
+        # with np.argmin() semantics.
+        centroids = self._cluster_centroids.reshape(-1)
+        argsort = np.argsort(centroids, kind='mergesort')
+        self._centroids_sorted = centroids[argsort]
+        self._centroid_argsort = argsort[np.searchsorted(self._centroids_sorted,
+                                                         self._centroids_sorted)]
+
     @chk.check(dict(S=chk.is_instance(vis.VisibilityMatrix),
                     G=chk.is_instance(gram.GramMatrix)))
     def __call__(self, S, G):
@@ -140,34 +182,225 @@ class IntensityFieldDataProcessorBlock(DataProcessorBlock):
 
            >>> cluster_idx  # useful for aggregation stage.
            array([0, 0])
+
+           # Single-precision eigendecomposition: outputs stay in double precision.
+           >>> I_dp32 = IntensityFieldDataProcessorBlock(N_eig=2,
+           ...                                           cluster_centroids=[0., 20.],
+           ...                                           precision=32)
+           >>> D32, V32, cluster_idx32 = I_dp32(S, G)
+
+           >>> D32.dtype, V32.dtype
+           (dtype('float64'), dtype('complex128'))
+
+           >>> np.around(D32, 2)
+           array([0.04, 0.03])
         """
         if not S.is_consistent_with(G, axes=[0, 0]):
             raise ValueError('Parameters[S, G] are inconsistent.')
 
         # Remove broken BEAM_IDs
+        # S is hermitian, so its column-sums are the conjugate of its
+        # row-sums: a single pass over S is sufficient.
+        row_sum = np.sum(S.data, axis=1)
+        working_mask = ~np.isclose(row_sum.conj(), row_sum)
+
+        # Functional PCA
         N_beam = len(G.data)
-        broken_row_id = np.flatnonzero(np.isclose(np.sum(S.data, axis=0),
-                                                  np.sum(S.data, axis=1)))
-        working_row_id = list(set(np.arange(N_beam)) - set(broken_row_id))
-        idx = np.ix_(working_row_id, working_row_id)
-        S, G = S.data[idx], G.data[idx]
+        V = np.zeros((N_beam, self._N_eig), dtype=np.complex128)
+        D = self._eigh(S.data, G.data, working_mask, out=V)
+
+        # Determine energy-level clustering
+        cluster_idx = self._nearest_centroid(D)
+
+        return D, V, cluster_idx
+
+    @chk.check(dict(S=chk.accept_any(chk.has_reals, chk.has_complex),
+                    G=chk.accept_any(chk.has_reals, chk.has_complex),
+                    N_worker=chk.allow_None(chk.is_integer)))
+    def process_batch(self, S, G, N_worker=None):
+        """
+        fPCA decomposition of several (S, G) pairs.
+
+        This method is equivalent to calling :py:meth:`~pypeline.phased_array.bluebild.data_processor.IntensityFieldDataProcessorBlock.__call__` on each snapshot, but eigendecompositions are run concurrently.
+
+        Parameters
+        ----------
+        S : :py:class:`~numpy.ndarray`
+            (N_snapshot, N_beam, N_beam) hermitian visibility matrices.
+        G : :py:class:`~numpy.ndarray`
+            (N_snapshot, N_beam, N_beam) hermitian gram matrices.
+        N_worker : int
+            Number of threads used to perform eigendecompositions. (Default = chosen by :py:class:`~concurrent.futures.ThreadPoolExecutor`)
+
+        Returns
+        -------
+        D : :py:class:`~numpy.ndarray`
+            (N_snapshot, N_eig) positive eigenvalues.
+
+        V : :py:class:`~numpy.ndarray`
+            (N_snapshot, N_beam, N_eig) complex-valued eigenvectors.
+
+        cluster_idx : :py:class:`~numpy.ndarray`
+            (N_snapshot, N_eig) cluster indices of each eigenpair.
+
+        Examples
+        --------
+        .. testsetup::
+
+           from pypeline.phased_array.util.data_gen.visibility import VisibilityMatrix
+           from pypeline.phased_array.util.gram import GramMatrix
+           from pypeline.phased_array.bluebild.data_processor import IntensityFieldDataProcessorBlock
+           import numpy as np
+           import pandas as pd
+           import scipy.linalg as linalg
+
+           def hermitian_array(N: int) -> np.ndarray:
+               '''
+               Construct a (N, N) Hermitian matrix.
+               '''
+               D = np.arange(N)
+               Rmtx = np.random.randn(N,N) + 1j * np.random.randn(N, N)
+               Q, _ = linalg.qr(Rmtx)
+
+               A = (Q * D) @ Q.conj().T
+               return A
+
+           np.random.seed(0)
+
+        .. doctest::
+
+           >>> N_snapshot, N_beam = 3, 5
+
+           # Some random visibility matrices
+           >>> S = np.stack([hermitian_array(N_beam) for _ in range(N_snapshot)])
+
+           # Some random positive-definite Gram matrices
+           >>> G = np.stack([hermitian_array(N_beam) + 100*np.eye(N_beam)
+           ...               for _ in range(N_snapshot)])
+
+           # Get compact energy level descriptors of all snapshots at once.
+           >>> I_dp = IntensityFieldDataProcessorBlock(N_eig=2,
+           ...                                         cluster_centroids=[0., 20.])
+           >>> D, V, cluster_idx = I_dp.process_batch(S, G)
+
+           >>> D.shape, V.shape, cluster_idx.shape
+           ((3, 2), (3, 5, 2), (3, 2))
+
+           # Same result as processing snapshots one at a time.
+           >>> beam_idx = pd.Index(range(N_beam), name='BEAM_ID')
+           >>> for t in range(N_snapshot):
+           ...     D_t, V_t, cluster_idx_t = I_dp(VisibilityMatrix(S[t], beam_idx),
+           ...                                    GramMatrix(G[t], beam_idx))
+           ...     print(np.allclose(D[t], D_t),
+           ...           np.allclose(V[t], V_t),
+           ...           np.array_equal(cluster_idx[t], cluster_idx_t))
+           True True True
+           True True True
+           True True True
+        """
+        S = np.array(S, copy=False)
+        G = np.array(G, copy=False)
+        if (S.ndim != 3) or (S.size == 0):
+            raise ValueError('Parameter[S] must be a non-empty (N_snapshot, '
+                             'N_beam, N_beam) array.')
+        N_snapshot = len(S)
+        N_beam = S.shape[-1]
+
+        shape = (N_snapshot, N_beam, N_beam)
+        if not (chk.has_shape(shape)(S) and chk.has_shape(shape)(G)):
+            raise ValueError('Parameters[S, G] must be (N_snapshot, N_beam, '
+                             'N_beam) arrays.')
+        if not np.allclose(S, S.conj().transpose(0, 2, 1)):
+            raise ValueError('Parameter[S] must be hermitian symmetric.')
+        if (N_worker is not None) and (N_worker <= 0):
+            raise ValueError('Parameter[N_worker] must be positive.')
+
+        # Remove broken BEAM_IDs
+        row_sum = np.sum(S, axis=2)
+        working_mask = ~np.isclose(row_sum.conj(), row_sum)
 
         # Functional PCA
-        if not np.allclose(S, 0):
+        D = np.zeros((N_snapshot, self._N_eig))
+        V = np.zeros((N_snapshot, N_beam, self._N_eig), dtype=np.complex128)
+
+        def eigh(t):
+            D[t] = self._eigh(S[t], G[t], working_mask[t], out=V[t])
+
+        # LAPACK releases the GIL: threads are sufficient to parallelize.
+        with futures.ThreadPoolExecutor(max_workers=N_worker) as executor:
+            list(executor.map(eigh, range(N_snapshot)))
+
+        # Determine energy-level clustering
+        cluster_idx = self._nearest_centroid(D)
+
+        return D, V, cluster_idx
+
+    def _eigh(self, S, G, working_mask, out):
+        """
+        Parameters
+        ----------
+        S : :py:class:`~numpy.ndarray`
+            (N_beam, N_beam) visibility coefficients.
+        G : :py:class:`~numpy.ndarray`
+            (N_beam, N_beam) gram coefficients.
+        working_mask : :py:class:`~numpy.ndarray`
+            (N_beam,) boolean mask of non-broken beams.
+        out : :py:class:`~numpy.ndarray`
+            (N_beam, N_eig) zero-initialized buffer in which eigenvectors are written.
+
+        Returns
+        -------
+        D : :py:class:`~numpy.ndarray`
+            (N_eig,) positive eigenvalues.
+        """
+        all_working = working_mask.all()
+        if not all_working:  # fancy-indexing copies (S, G): only pay when needed.
+            S = S[working_mask][:, working_mask]
+            G = G[working_mask][:, working_mask]
+        S = np.ascontiguousarray(S, dtype=self._cp if np.iscomplexobj(S) else self._fp)
+        G = np.ascontiguousarray(G, dtype=self._cp if np.iscomplexobj(G) else self._fp)
+
+        # Same test as np.allclose(S, 0), i.e. max_ij |S_ij| <= 1e-8, but with
+        # a single temporary. (S is empty if all beams are broken.)
+        if (S.size > 0) and (np.abs(S).max() > 1e-8):
             D, V = pylinalg.eigh(S, G, tau=1, N=self._N_eig)
+            D = D.astype(np.float64)
+            if all_working:
+                out[:] = V
+            else:
+                out[working_mask] = V  # broken BEAM_IDs keep null coefficients.
         else:  # S is broken beyond use
-            D, V = np.zeros(self._N_eig), 0
+            D = np.zeros(self._N_eig)
 
-        # Add broken BEAM_IDs
-        V_aligned = np.zeros((N_beam, self._N_eig), dtype=np.complex)
-        V_aligned[working_row_id] = V
+        return D
 
-        # Determine energy-level clustering
-        cluster_dist = np.absolute(D.reshape(-1, 1) -
-                                   self._cluster_centroids.reshape(1, -1))
-        cluster_idx = np.argmin(cluster_dist, axis=1)
+    def _nearest_centroid(self, D):
+        """
+        Parameters
+        ----------
+        D : :py:class:`~numpy.ndarray`
+            (N_eig,) eigenvalues.
+
+        Returns
+        -------
+        cluster_idx : :py:class:`~numpy.ndarray`
+            (N_eig,) index of the centroid closest to each eigenvalue.
+        """
+        centroids = self._centroids_sorted
+        N_centroid = len(centroids)
 
-        return D, V_aligned, cluster_idx
+        # The closest centroid is one of the 2 neighbours of D in `centroids`.
+        hi = np.clip(np.searchsorted(centroids, D), 0, N_centroid - 1)
+        lo = np.clip(hi - 1, 0, N_centroid - 1)
+        dist_lo = np.absolute(D - centroids[lo])
+        dist_hi = np.absolute(D - centroids[hi])
+        idx_lo = self._centroid_argsort[lo]
+        idx_hi = self._centroid_argsort[hi]
+
+        cluster_idx = np.where(dist_lo < dist_hi, idx_lo,
+                               np.where(dist_hi < dist_lo, idx_hi,
+                                        np.minimum(idx_lo, idx_hi)))
+        return cluster_idx
 
 
 class SensitivityFieldDataProcessorBlock(DataProcessorBlock):
@@ -175,13 +408,19 @@ class SensitivityFieldDataProcessorBlock(DataProcessorBlock):
     Data processor for computing sensitivity fields.
     """
 
-    @chk.check('N_eig', chk.is_integer)
-    def __init__(self, N_eig):
+    @chk.check(dict(N_eig=chk.is_integer,
+                    precision=chk.is_integer))
+    def __init__(self, N_eig, precision=64):
         """
         Parameters
         ----------
         N_eig : int
             Number of eigenpairs to output after PCA decomposition.
+        precision : int
+            Numerical accuracy of the eigendecomposition.
+
+            Must be 32 or 64.
+            Outputs are always returned in double precision.
 
         Notes
         -----
@@ -191,8 +430,13 @@ class SensitivityFieldDataProcessorBlock(DataProcessorBlock):
             raise ValueError('Parameter[N_eig] must be positive.')
 
         super().__init__()
+        self._fp, self._cp = _precision_dtypes(precision)
         self._N_eig = N_eig
 
+        # Buffered attributes
+        self._G = None
+        self._DV = None
+
     @chk.check('G', chk.is_instance(gram.GramMatrix))
     def __call__(self, G):
         """
@@ -247,9 +491,56 @@ class SensitivityFieldDataProcessorBlock(DataProcessorBlock):
 
            >>> np.around(D, 6)
            array([9.2e-05, 9.4e-05])
+
+           # Single-precision eigendecomposition: outputs stay in double precision.
+           >>> S_dp32 = SensitivityFieldDataProcessorBlock(N_eig=2, precision=32)
+           >>> D32, V32 = S_dp32(G)
+
+           >>> D32.dtype, V32.dtype
+           (dtype('float64'), dtype('complex128'))
+
+           >>> np.around(D32, 6)
+           array([9.2e-05, 9.4e-05])
         """
-        N_beam = len(G.data)
-        D, V = pylinalg.eigh(G.data, np.eye(N_beam), tau=1, N=self._N_eig)
-        Dg = 1 / (D ** 2)
+        # Gram matrices of stationary instruments do not change between calls.
+        if (self._G is None) or (not np.array_equal(self._G, G.data)):
+            self._G = np.array(G.data)
+            self._DV = self._eigh(self._G)
+
+        Dg, V = self._DV
+        return Dg.copy(), V.copy()
+
+    def _eigh(self, G):
+        """
+        Parameters
+        ----------
+        G : :py:class:`~numpy.ndarray`
+            (N_beam, N_beam) gram coefficients.
 
+        Returns
+        -------
+        Dg : :py:class:`~numpy.ndarray`
+            (N_eig,) positive eigenvalues.
+
+        V : :py:class:`~numpy.ndarray`
+            (N_beam, N_eig) complex-valued eigenvectors.
+        """
+        # Only the N_eig leading eigenpairs of G are computed.
+        N_beam = len(G)
+        N = min(self._N_eig, N_beam)
+        G = G.astype(self._cp if np.iscomplexobj(G) else self._fp, copy=False)
+        D, V = linalg.eigh(G, subset_by_index=[N_beam - N, N_beam - 1])
+        D = D.astype(np.float64)
+        V = V.astype(np.complex128 if np.iscomplexobj(V) else np.float64)
+
+        # Discard non-positive D, sort in decreasing order, then zero-pad.
+        idx = D > 0
+        D, V = D[idx][::-1], V[:, idx][:, ::-1]
+        K = len(D)
+        if K < self._N_eig:
+            D = np.concatenate((D, np.zeros(self._N_eig - K)), axis=0)
+            V = np.concatenate((V, np.zeros((N_beam, self._N_eig - K))), axis=1)
+
+        Dg = D ** 2
+        np.reciprocal(Dg, out=Dg)
         return Dg, V
@@ -16,6 +16,7 @@ Only positional information is modeled at the moment, and can be accessed throug
  * :py:class:`~pypeline.phased_array.instrument.InstrumentGeometry` : container for positional information.
 """
 
+import functools
 import pathlib
 
 import astropy.coordinates as coord
@@ -29,7 +30,6 @@ import scipy.linalg as linalg
 import pypeline.core as core
 import pypeline.util.argcheck as chk
 import pypeline.util.array as array
-import pypeline.util.math.linalg as pylinalg
 import pypeline.util.math.special as sp
 import pypeline.util.math.sphere as sph
 
@@ -55,6 +55,41 @@ def is_antenna_index(x):
     return False
 
 
+def _rot_batch(axis, angle):
+    """
+    Vectorized version of :py:func:`~pypeline.util.math.linalg.rot`.
+
+    Parameters
+    ----------
+    axis : :py:class:`~numpy.ndarray`
+        (3,) or (N, 3) rotation axes.
+    angle : :py:class:`~numpy.ndarray`
+        (N,) signed rotation angles [rad].
+
+    Returns
+    -------
+    R : :py:class:`~numpy.ndarray`
+        (N, 3, 3) rotation matrices.
+    """
+    angle = np.array(angle, dtype=float, copy=False)
+    axis = np.broadcast_to(axis, angle.shape + (3,)).astype(float)
+    if np.any(np.all(np.isclose(axis, 0), axis=-1)):
+        raise ValueError('Cannot rotate around null-vector.')
+    axis = axis / linalg.norm(axis, axis=-1, keepdims=True)
+
+    a, b, c = axis[..., 0], axis[..., 1], axis[..., 2]
+    zero = np.zeros_like(a)
+    K = np.stack([np.stack([zero, -c, b], axis=-1),
+                  np.stack([c, zero, -a], axis=-1),
+                  np.stack([-b, a, zero], axis=-1)], axis=-2)
+
+    # Rodrigues' formula: R = I + sin(angle) K + (1 - cos(angle)) K^2
+    sin_angle = np.sin(angle)[..., np.newaxis, np.newaxis]
+    cos_angle = np.cos(angle)[..., np.newaxis, np.newaxis]
+    R = np.eye(3) + sin_angle * K + (1 - cos_angle) * (K @ K)
+    return R
+
+
 def _as_InstrumentGeometry(df):
     XYZ = InstrumentGeometry(xyz=df.values,
                              ant_idx=df.index)
@@ -96,8 +131,9 @@ class InstrumentGeometry(array.LabeledMatrix):
     """
 
     @chk.check(dict(xyz=chk.has_reals,
-                    ant_idx=is_antenna_index))
-    def __init__(self, xyz, ant_idx):
+                    ant_idx=is_antenna_index,
+                    precision=chk.allow_None(chk.is_integer)))
+    def __init__(self, xyz, ant_idx, precision=None):
         """
         Parameters
         ----------
@@ -105,8 +141,21 @@ class InstrumentGeometry(array.LabeledMatrix):
             (N_antenna, 3) Cartesian coordinates.
         ant_idx : :py:class:`~pandas.MultiIndex`
             (N_antenna,) index.
-        """
-        xyz = np.array(xyz, copy=False)
+        precision : int
+            If specified, store coordinates as C-contiguous 32 or 64-bit floats. (Default = keep `xyz` as is.)
+
+            Single precision halves memory traffic of downstream operations, but only has 7 significant digits:
+            it is adequate for compact arrays (ex: microphone arrays) or station-centered coordinates, but not for geocentric coordinates of radio telescopes where it introduces errors of up to 0.5 [m].
+        """
+        if precision is None:
+            xyz = np.array(xyz, copy=False)
+        elif precision == 32:
+            xyz = np.ascontiguousarray(xyz, dtype=np.float32)
+        elif precision == 64:
+            xyz = np.ascontiguousarray(xyz, dtype=np.float64)
+        else:
+            raise ValueError('Parameter[precision] must be 32 or 64.')
+
         N_antenna = len(xyz)
         if not chk.has_shape((N_antenna, 3))(xyz):
             raise ValueError('Parameter[xyz] must be a (N_antenna, 3) array.')
@@ -244,6 +293,12 @@ class InstrumentGeometryBlock(core.Block):
                                  .get_level_values('STATION_ID'))[:N_station]
             self._layout = self._layout.loc[stations]
 
+        # (3, N_antenna) coordinates, extracted once for use in __call__().
+        self._layout_xyz = np.ascontiguousarray(self._layout
+                                                .loc[:, ['X', 'Y', 'Z']]
+                                                .values.T)
+        self._layout_index = self._layout.index
+
     def __call__(self, *args, **kwargs):
         """
         Determine instrument antenna positions.
@@ -308,8 +363,9 @@ class StationaryInstrumentGeometryBlock(InstrumentGeometryBlock):
     """
 
     @chk.check(dict(XYZ=chk.is_instance(InstrumentGeometry),
-                    N_station=chk.allow_None(chk.is_integer)))
-    def __init__(self, XYZ, N_station=None):
+                    N_station=chk.allow_None(chk.is_integer),
+                    precision=chk.is_integer))
+    def __init__(self, XYZ, N_station=None, precision=64):
         """
         Parameters
         ----------
@@ -320,9 +376,18 @@ class StationaryInstrumentGeometryBlock(InstrumentGeometryBlock):
 
             Sometimes only a subset of an instrument's stations are desired.
             Setting `N_station` limits the number of stations to those that appear first in `XYZ` when sorted by STATION_ID.
+        precision : int
+            Numerical accuracy of antenna positions returned by :py:meth:`~pypeline.phased_array.instrument.StationaryInstrumentGeometryBlock.__call__`.
+
+            Must be 32 or 64.
         """
         super().__init__(XYZ, N_station)
 
+        # The geometry never changes: it is formed once.
+        self._XYZ = InstrumentGeometry(xyz=self._layout_xyz.T,
+                                       ant_idx=self._layout_index,
+                                       precision=precision)
+
     def __call__(self):
         """
         Determine instrument antenna positions.
@@ -338,6 +403,7 @@ class StationaryInstrumentGeometryBlock(InstrumentGeometryBlock):
         --------
         .. testsetup::
 
+           import numpy as np
            from pypeline.phased_array.instrument import PyramicBlock
 
         .. doctest::
@@ -350,8 +416,17 @@ class StationaryInstrumentGeometryBlock(InstrumentGeometryBlock):
                   [-0.038, -0.065,  0.075],
                   [-0.042, -0.073,  0.088],
                   [-0.044, -0.077,  0.095]])
+
+           # Single-precision positions: adequate for compact arrays.
+           >>> instr32 = PyramicBlock(precision=32)
+           >>> xyz32 = instr32().data
+           >>> xyz32.dtype
+           dtype('float32')
+
+           >>> np.allclose(xyz32, instr().data, atol=1e-7)
+           True
         """
-        return _as_InstrumentGeometry(self._layout)
+        return self._XYZ
 
     @chk.check('wl', chk.is_real)
     def bfsf_kernel_bandwidth(self, wl):
@@ -405,12 +480,17 @@ class PyramicBlock(StationaryInstrumentGeometryBlock):
     Pyramic 48-element 3D microphone array.
     """
 
-    def __init__(self):
+    def __init__(self, precision=64):
         """
+        Parameters
+        ----------
+        precision : int
+            Numerical accuracy of antenna positions.
 
+            Must be 32 or 64.
         """
         XYZ = self._get_geometry()
-        super().__init__(XYZ)
+        super().__init__(XYZ, precision=precision)
 
     def _get_geometry(self):
         """
@@ -429,19 +509,16 @@ class PyramicBlock(StationaryInstrumentGeometryBlock):
         # Relative placement of microphones on one PCB.
         pcb = np.r_[-0.100, -0.060, -0.020, -0.004, 0.004, 0.020, 0.060, 0.100]
 
-        def line(p1, p2, dist):
-            center = (p1 + p2) / 2.
-            unit_vec = (p2 - p1) / linalg.norm(p2 - p1)
-
-            pts = [center + d * unit_vec for d in dist]
-            return pts
+        # PCB end-points: 6 edges of the tetrahedron.
+        p1 = corners[:, [0, 3, 0, 1, 0, 2]].T
+        p2 = corners[:, [3, 2, 1, 3, 2, 1]].T
+        center = (p1 + p2) / 2
+        unit_vec = p2 - p1
+        unit_vec /= linalg.norm(unit_vec, axis=1, keepdims=True)
 
-        coordinates = np.array(line(corners[:, 0], corners[:, 3], pcb) +
-                               line(corners[:, 3], corners[:, 2], pcb) +
-                               line(corners[:, 0], corners[:, 1], pcb) +
-                               line(corners[:, 1], corners[:, 3], pcb) +
-                               line(corners[:, 0], corners[:, 2], pcb) +
-                               line(corners[:, 2], corners[:, 1], pcb))
+        coordinates = np.reshape(center[:, np.newaxis, :] +
+                                 pcb[np.newaxis, :, np.newaxis] *
+                                 unit_vec[:, np.newaxis, :], (-1, 3))
 
         # Reference point is 1cm below zero-th microphone
         coordinates[:, 2] += 0.01 - coordinates[0, 2]
@@ -458,12 +535,17 @@ class CompactSixBlock(StationaryInstrumentGeometryBlock):
     Compact-Six 6-element ring microphone array.
     """
 
-    def __init__(self):
+    def __init__(self, precision=64):
         """
+        Parameters
+        ----------
+        precision : int
+            Numerical accuracy of antenna positions.
 
+            Must be 32 or 64.
         """
         XYZ = self._get_geometry()
-        super().__init__(XYZ)
+        super().__init__(XYZ, precision=precision)
 
     def _get_geometry(self):
         """
@@ -477,9 +559,11 @@ class CompactSixBlock(StationaryInstrumentGeometryBlock):
         radius = 0.0675
 
         angle = np.linspace(0, 2 * np.pi, num=N_mic, endpoint=False)
-        coordinates = radius * np.stack((np.cos(angle),
-                                         np.sin(angle),
-                                         np.zeros(N_mic)), axis=1)
+        coordinates = np.empty((N_mic, 3))
+        np.cos(angle, out=coordinates[:, 0])
+        np.sin(angle, out=coordinates[:, 1])
+        coordinates[:, 2] = 0
+        coordinates *= radius
 
         idx = pd.MultiIndex.from_product([range(N_mic), range(1)],
                                          names=['STATION_ID', 'ANTENNA_ID'])
@@ -508,6 +592,10 @@ class EarthBoundInstrumentGeometryBlock(InstrumentGeometryBlock):
         """
         super().__init__(XYZ, N_station)
 
+        # Buffered attributes
+        self._icrs_time = None
+        self._icrs_layout = None
+
     @chk.check('time', chk.is_instance(time.Time))
     def __call__(self, time):
         """
@@ -552,19 +640,26 @@ class EarthBoundInstrumentGeometryBlock(InstrumentGeometryBlock):
                   [ 1620400.53, -3497583.69,  5064544.37],
                   [ 1620405.5 , -3497583.23,  5064543.11]])
         """
-        layout = self._layout.loc[:, ['X', 'Y', 'Z']].values.T
-        r = linalg.norm(layout, axis=0)
-
-        itrs_layout = coord.CartesianRepresentation(layout)
-        itrs_position = coord.SkyCoord(itrs_layout, obstime=time, frame='itrs')
-        icrs_position = r * (itrs_position
-                             .transform_to('icrs')
-                             .cartesian
-                             .xyz)
-        icrs_layout = pd.DataFrame(data=icrs_position.T,
-                                   index=self._layout.index,
-                                   columns=('X', 'Y', 'Z'))
-        return _as_InstrumentGeometry(icrs_layout)
+        # The ITRS -> ICRS transform is not a pure rotation (aberration and
+        # light deflection are direction-dependent), so it cannot be reduced
+        # to a (3, 3) matrix. Instead the result of the last epoch is kept.
+        time_key = (time.scale, float(time.jd1), float(time.jd2))
+        if time_key != self._icrs_time:
+            layout = self._layout_xyz
+            r = linalg.norm(layout, axis=0)
+
+            itrs_layout = coord.CartesianRepresentation(layout)
+            itrs_position = coord.SkyCoord(itrs_layout, obstime=time,
+                                           frame='itrs')
+            icrs_position = r * (itrs_position
+                                 .transform_to('icrs')
+                                 .cartesian
+                                 .xyz)
+            self._icrs_time = time_key
+            self._icrs_layout = np.array(icrs_position.T)
+
+        return InstrumentGeometry(xyz=self._icrs_layout,
+                                  ant_idx=self._layout_index)
 
     @chk.check(dict(obs_start=chk.is_instance(time.Time),
                     obs_end=chk.is_instance(time.Time)))
@@ -717,10 +812,14 @@ class LofarBlock(EarthBoundInstrumentGeometryBlock):
         XYZ = self._get_geometry()
         super().__init__(XYZ, N_station)
 
-    def _get_geometry(self):
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_geometry():
         """
         Load instrument geometry.
 
+        The geometry is only loaded from disk once per session.
+
         Returns
         -------
         :py:class:`~pypeline.phased_array.instrument.InstrumentGeometry`
@@ -762,10 +861,14 @@ class MwaBlock(EarthBoundInstrumentGeometryBlock):
         XYZ = self._get_geometry(station_only)
         super().__init__(XYZ, N_station)
 
-    def _get_geometry(self, station_only):
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_geometry(station_only):
         """
         Load instrument geometry.
 
+        The geometry is only loaded from disk once per session.
+
         Parameters
         ----------
         station_only : bool
@@ -798,26 +901,24 @@ class MwaBlock(EarthBoundInstrumentGeometryBlock):
             l = np.stack((lX, lY, np.zeros((4, 4))), axis=0)
 
             # For each station: rotate 4x4 array to lie on the sphere's surface.
+            # All (N_station, 3, 3) rotations are computed in a single pass.
             xyz_station = itrs_geom.loc[:, ['X', 'Y', 'Z']].values
-            df_stations = []
-            for st_id, st_cog in zip(station_id, xyz_station):
-                _, st_colat, st_lon = sph.cart2pol(*st_cog)
-                st_cog_unit = np.array(sph.pol2cart(1, st_colat, st_lon))
-
-                R_1 = pylinalg.rot([0, 0, 1], st_lon)
-                R_2 = pylinalg.rot(axis=np.cross([0, 0, 1], st_cog_unit),
-                                   angle=st_colat)
-                R = R_2 @ R_1
-
-                st_layout = np.reshape(st_cog.reshape(3, 1, 1) +
-                                       np.tensordot(R, l, axes=1), (3, -1))
-                idx = (pd.MultiIndex
-                       .from_product([[st_id], range(16)],
-                                     names=['STATION_ID', 'ANTENNA_ID']))
-                df_stations += [pd.DataFrame(data=st_layout.T,
-                                             index=idx,
-                                             columns=['X', 'Y', 'Z'])]
-            itrs_geom = pd.concat(df_stations)
+            _, st_colat, st_lon = sph.cart2pol(*xyz_station.T)
+            st_cog_unit = np.stack(sph.pol2cart(1, st_colat, st_lon), axis=1)
+
+            R_1 = _rot_batch(np.r_[0, 0, 1], st_lon)
+            R_2 = _rot_batch(np.cross([0, 0, 1], st_cog_unit), st_colat)
+            R = R_2 @ R_1
+
+            st_layout = (xyz_station[:, :, np.newaxis] +
+                         np.einsum('sij,jk->sik', R, l.reshape(3, -1)))
+            xyz = np.reshape(st_layout.transpose(0, 2, 1), (-1, 3))
+            idx = (pd.MultiIndex
+                   .from_product([station_id, range(16)],
+                                 names=['STATION_ID', 'ANTENNA_ID']))
+            itrs_geom = pd.DataFrame(data=xyz,
+                                     index=idx,
+                                     columns=['X', 'Y', 'Z'])
 
         XYZ = _as_InstrumentGeometry(itrs_geom)
         return XYZ
@@ -185,7 +185,9 @@ class VisibilityGeneratorBlock(core.Block):
         noise_var = np.sum(self._sky_model.intensity) / (2 * self._SNR)
         S_noise = W.data.conj().T @ (noise_var * W.data)
 
-        wishart = stat.Wishart(V=S_sky + S_noise, n=self._N_sample)
+        # (S_sky + S_noise) is Hermitian by construction.
+        wishart = stat.Wishart(V=S_sky + S_noise, n=self._N_sample,
+                               validate=False)
         S = wishart()[0] / self._N_sample
         return VisibilityMatrix(data=S, beam_idx=W.index[1])
 
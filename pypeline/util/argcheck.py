@@ -28,7 +28,8 @@ def check(*args):
     It is common to check parameters for correctness before executing the function/class to which they are bound using boolean tests.
     :py:func:`~pypeline.util.argcheck.check` is a decorator that intercepts the output of boolean functions and raises :py:exc:`ValueError` when the result is :py:obj:`False`.
 
-    This function can be completely disabled by setting the ``util.argcheck.check.ignore_checks`` flag to ``False``.
+    This function can be completely disabled by setting the ``util.argcheck.check.ignore_checks`` flag to ``True``.
+    Checks are also disabled when the Python interpreter runs in optimized mode (``python -O``).
 
     Parameters
     ----------
@@ -135,10 +136,11 @@ def _check(m):
             raise TypeError(value_error(k))
 
     def decorator(func):
-        # Ignore checks if appropriate config flag set.
+        # Ignore checks if appropriate config flag set or if assertions are
+        # disabled. (python -O)
         ignore_checks = pypeline.config.getboolean('util.argcheck.check',
                                                    'ignore_checks')
-        if ignore_checks:
+        if ignore_checks or (not __debug__):
             return func
 
         @functools.wraps(func)
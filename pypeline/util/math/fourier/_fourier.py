@@ -5,12 +5,12 @@
 # ##############################################################################
 
 import cmath
+import functools
 
 import numpy as np
-import scipy.fftpack as fftpack
+import scipy.fft as fft
 
 import pypeline.util.argcheck as chk
-import pypeline.util.array as array
 
 
 @chk.check(dict(x=chk.accept_any(chk.has_reals, chk.has_complex),
@@ -116,28 +116,35 @@ def ffs(x, T, T_c, N_FS, axis=-1):
     if not (-x.ndim <= axis < x.ndim):
         raise ValueError('Parameter[axis] is out-of-bounds.')
 
-    M, N = np.r_[N_s, N_FS] // 2
-    E_1 = np.r_[-N:(N + 1), np.zeros(N_s - N_FS, dtype=int)]
-    B_2 = np.exp(-1j * 2 * np.pi / N_s)
-    if chk.is_odd(N_s):
-        B_1 = np.exp(1j * (2 * np.pi / T) * T_c)
-        E_2 = np.r_[0:(M + 1), -M:0]
+    N = N_FS // 2
+    C_1, C_2 = _ffs_twiddles(N_s, N_FS, T, T_c, inverse=False)
+
+    if axis not in (-1, x.ndim - 1):  # 1D modulations broadcast along last axis.
+        sh = [1] * x.ndim
+        sh[axis] = N_s
+        C_1 = np.reshape(C_1, sh)
+        C_2 = np.reshape(C_2, sh)
+
+    if np.isrealobj(x):
+        # Modulation by C_2 amounts to a circular shift of the spectrum by N:
+        # the full spectrum is rebuilt from the half-spectrum of a real FFT
+        # using conjugate symmetry.
+        X_h = fft.rfft(x, axis=axis, workers=-1)
+        X_FS = np.empty(x.shape, dtype=X_h.dtype)
+
+        # Work on views with the transform axis last.
+        X_h, X_v = np.moveaxis(X_h, axis, -1), np.moveaxis(X_FS, axis, -1)
+        H = X_h.shape[-1]
+        X_v[..., N:(N + H)] = X_h
+        np.conjugate(X_h[..., N:0:-1], out=X_v[..., :N])
+        np.conjugate(X_h[..., (N_s - H):N:-1], out=X_v[..., (N + H):])
     else:
-        B_1 = np.exp(1j * (2 * np.pi / T) * (T_c + T / (2 * N_s)))
-        E_2 = np.r_[0:M, -M:0]
-
-    sh = [1] * x.ndim
-    sh[axis] = N_s
-    C_1 = np.reshape(B_1 ** (- E_1), sh)
-    C_2 = np.reshape(B_2 ** (- N * E_2), sh)
-
-    # Cast C_2 to 32 bits if x is 32 bits. (Allows faster transforms.)
-    if ((x.dtype == np.dtype('complex64')) or
-            (x.dtype == np.dtype('float32'))):
-        C_2 = C_2.astype(np.complex64)
+        # Cast C_2 to 32 bits if x is 32 bits. (Allows faster transforms.)
+        if x.dtype == np.dtype('complex64'):
+            C_2 = C_2.astype(np.complex64)
 
-    X_FS = fftpack.fft(x * C_2, axis=axis)
-    X_FS *= C_1 / N_s
+        X_FS = fft.fft(x * C_2, axis=axis, overwrite_x=True, workers=-1)
+    X_FS *= C_1
     return X_FS
 
 
@@ -192,29 +199,79 @@ def iffs(x_FS, T, T_c, N_FS, axis=-1):
     if not (-x_FS.ndim <= axis < x_FS.ndim):
         raise ValueError('Parameter[axis] is out-of-bounds.')
 
+    C_1, C_2 = _ffs_twiddles(N_s, N_FS, T, T_c, inverse=True)
+
+    if axis not in (-1, x_FS.ndim - 1):  # 1D modulations broadcast along last axis.
+        sh = [1] * x_FS.ndim
+        sh[axis] = N_s
+        C_1 = np.reshape(C_1, sh)
+        C_2 = np.reshape(C_2, sh)
+
+    # Cast C_1 to 32 bits if x_FS is 32 bits. (Allows faster transforms.)
+    if ((x_FS.dtype == np.dtype('complex64')) or
+            (x_FS.dtype == np.dtype('float32'))):
+        C_1 = C_1.astype(np.complex64)
+
+    X = fft.ifft(x_FS * C_1, axis=axis, overwrite_x=True, workers=-1)
+    X *= C_2
+    return X
+
+
+@functools.lru_cache(maxsize=128)
+def _ffs_twiddles(N_s, N_FS, T, T_c, inverse):
+    """
+    Input-independent terms of :py:func:`~pypeline.util.math.fourier.ffs` and :py:func:`~pypeline.util.math.fourier.iffs`.
+
+    Parameters
+    ----------
+    N_s : int
+        Number of samples.
+    N_FS : int
+        Function bandwidth.
+    T : float
+        Function period.
+    T_c : float
+        Period mid-point.
+    inverse : bool
+        If :py:obj:`True`, return the terms of :py:func:`~pypeline.util.math.fourier.iffs`.
+
+    Returns
+    -------
+    C_1 : :py:class:`~numpy.ndarray`
+        (N_s,) modulation applied on the FS side of the transform.
+        Includes the :math:`1 / N_{s}` normalization of :py:func:`~pypeline.util.math.fourier.ffs`.
+    C_2 : :py:class:`~numpy.ndarray`
+        (N_s,) modulation applied on the sample side of the transform.
+        Includes the :math:`N_{s}` normalization of :py:func:`~pypeline.util.math.fourier.iffs`.
+
+    Notes
+    -----
+    Outputs are cached, hence read-only.
+    """
     M, N = np.r_[N_s, N_FS] // 2
     E_1 = np.r_[-N:(N + 1), np.zeros(N_s - N_FS, dtype=int)]
-    B_2 = np.exp(-1j * 2 * np.pi / N_s)
+    phi_2 = -2 * np.pi / N_s
     if chk.is_odd(N_s):
-        B_1 = np.exp(1j * (2 * np.pi / T) * T_c)
+        phi_1 = (2 * np.pi / T) * T_c
         E_2 = np.r_[0:(M + 1), -M:0]
     else:
-        B_1 = np.exp(1j * (2 * np.pi / T) * (T_c + T / (2 * N_s)))
+        phi_1 = (2 * np.pi / T) * (T_c + T / (2 * N_s))
         E_2 = np.r_[0:M, -M:0]
 
-    sh = [1] * x_FS.ndim
-    sh[axis] = N_s
-    C_1 = np.reshape(B_1 ** (E_1), sh)
-    C_2 = np.reshape(B_2 ** (N * E_2), sh)
+    # C_k = B_k ** (+-E_k) with B_k = exp(j * phi_k) on the unit circle.
+    sign = 1 if inverse else -1
+    C_1 = np.exp((1j * sign * phi_1) * E_1)
+    C_2 = np.exp((1j * sign * N * phi_2) * E_2)
 
-    # Cast C_1 to 32 bits if x_FS is 32 bits. (Allows faster transforms.)
-    if ((x_FS.dtype == np.dtype('complex64')) or
-            (x_FS.dtype == np.dtype('float32'))):
-        C_1 = C_1.astype(np.complex64)
+    # Transform normalization is applied with the post-FFT modulation.
+    if inverse:
+        C_2 *= N_s
+    else:
+        C_1 /= N_s
 
-    X = fftpack.ifft(x_FS * C_1, axis=axis)
-    X *= C_2 * N_s
-    return X
+    for arr in (C_1, C_2):
+        arr.setflags(write=False)
+    return C_1, C_2
 
 
 @chk.check(dict(x=chk.accept_any(chk.has_reals, chk.has_complex),
@@ -245,11 +302,15 @@ def czt(x, A, W, M, axis=-1):
     -------
     :py:class:`~numpy.ndarray`
         (..., M, ...) transformed input along the axis indicated by `axis`.
+        The output is complex64 if `x` is 32 bits, complex128 otherwise.
+        An empty input (N = 0) transforms to M zeros.
 
     Notes
     -----
     Due to numerical instability when using large `M`, this implementation only supports transforms where `A` and `W` have unit norm.
 
+    Transforms are batched over all dimensions other than `axis` and computed with a single FFT/iFFT pair: stacking many short signals into one array is much faster than calling :py:func:`~pypeline.util.math.fourier.czt` on each of them.
+
     Examples
     --------
     .. testsetup::
@@ -301,41 +362,125 @@ def czt(x, A, W, M, axis=-1):
     if not (-x.ndim <= axis < x.ndim):
         raise ValueError('Parameter[axis] is out-of-bounds.')
 
+    return _czt(x, A, W, M, axis)
+
+
+def _czt(x, A, W, M, axis):
+    """
+    Chirp Z-Transform, without parameter validation.
+
+    Parameters
+    ----------
+    x : :py:class:`~numpy.ndarray`
+        (..., N, ...) input array.
+    A : complex
+        Circular offset from the positive real-axis. (Unit norm.)
+    W : complex
+        Circular spacing between transform points. (Unit norm.)
+    M : int
+        Length of the transform. (Positive.)
+    axis : int
+        Dimension of `x` along which the samples are stored. (In-bounds.)
+
+    Returns
+    -------
+    :py:class:`~numpy.ndarray`
+        (..., M, ...) transformed input along the axis indicated by `axis`.
+
+    Notes
+    -----
+    Used by functions which call :py:func:`~pypeline.util.math.fourier.czt` with parameters that are valid by construction.
+    """
     # Shape Parameters
     N = x.shape[axis]
-    sh_N = [1] * x.ndim
-    sh_N[axis] = N
-    sh_M = [1] * x.ndim
-    sh_M[axis] = M
-
-    L = fftpack.next_fast_len(N + M - 1)
-    sh_L = [1] * x.ndim
-    sh_L[axis] = L
+    # Single-precision inputs are transformed in single precision.
+    if ((x.dtype == np.dtype('complex64')) or
+            (x.dtype == np.dtype('float32'))):
+        dtype = np.dtype('complex64')
+    else:
+        dtype = np.dtype('complex128')
+
+    y_mod, V, g_mod = _czt_kernel(N, M, A, W, dtype)
+    L = len(V)
     sh_Y = list(x.shape)
     sh_Y[axis] = L
 
-    n = np.arange(L)
-    y = np.zeros(sh_Y, dtype=complex)
-    y_mod = (A ** -n[:N]) * np.float_power(W, (n[:N] ** 2) / 2)
-    y[array.index(y, axis, slice(N))] = x
-    y[array.index(y, axis, slice(N))] *= y_mod.reshape(sh_N)
-    Y = fftpack.fft(y, axis=axis)
-
-    v = np.zeros(L, dtype=complex)
-    v[:M] = np.float_power(W, - (n[:M] ** 2) / 2)
-    v[L - N + 1:] = np.float_power(W, - ((L - n[L - N + 1:]) ** 2) / 2)
-    V = fftpack.fft(v).reshape(sh_L)
+    # A single (..., L, ...) buffer is used throughout: complex transforms
+    # with overwrite_x=True are done in-place. Element-wise operations act on
+    # views with the transform axis last, where (y_mod, V, g_mod) broadcast.
+    y = np.empty(sh_Y, dtype=dtype)
+    y_v = np.moveaxis(y, axis, -1)
+    y_v[..., N:] = 0
+    np.multiply(np.moveaxis(x, axis, -1), y_mod, out=y_v[..., :N])
+    Y = fft.fft(y, axis=axis, overwrite_x=True, workers=-1)
 
     G = Y
-    G *= V
-    g = fftpack.ifft(G, axis=axis)
-    g_mod = np.float_power(W, (n[:M] ** 2) / 2)
-    g[array.index(g, axis, slice(M))] *= g_mod.reshape(sh_M)
+    np.moveaxis(G, axis, -1)[...] *= V
+    g = fft.ifft(G, axis=axis, overwrite_x=True, workers=-1)
+    g_v = np.moveaxis(g, axis, -1)[..., :M]  # L >= M, even if N == 0.
+    g_v *= g_mod
 
-    X = g[array.index(g, axis, slice(M))]
+    X = np.moveaxis(g_v, -1, axis)
     return X
 
 
+@functools.lru_cache(maxsize=64)
+def _czt_kernel(N, M, A, W, dtype):
+    """
+    Input-independent terms of :py:func:`~pypeline.util.math.fourier.czt`.
+
+    Parameters
+    ----------
+    N : int
+        Length of the input.
+    M : int
+        Length of the transform.
+    A : complex
+        Circular offset from the positive real-axis.
+    W : complex
+        Circular spacing between transform points.
+    dtype : :py:class:`~numpy.dtype`
+        Complex dtype of the outputs.
+
+    Returns
+    -------
+    y_mod : :py:class:`~numpy.ndarray`
+        (N,) input modulation.
+    V : :py:class:`~numpy.ndarray`
+        (L,) FFT of the chirp filter, where L >= max(N + M - 1, M) is the length of the transforms.
+    g_mod : :py:class:`~numpy.ndarray`
+        (M,) output modulation.
+
+    Notes
+    -----
+    Outputs are computed in double precision, then cast to `dtype`.
+    Outputs are cached, hence read-only.
+    """
+    L = fft.next_fast_len(max(N + M - 1, M), real=False)
+    n = np.arange(L, dtype=float)
+    n_sq = np.multiply(n, n)
+
+    # A, W have unit norm: chirps are evaluated as exp(j * phase) rather than
+    # through complex powers.
+    theta_A, theta_W = cmath.phase(A), cmath.phase(W)
+
+    y_mod = np.exp(1j * (0.5 * theta_W * n_sq[:N] - theta_A * n[:N]))
+
+    v = np.empty(L, dtype=complex)
+    v[M:(L - N + 1)] = 0
+    v[:M] = np.exp(-0.5j * theta_W * n_sq[:M])
+    v[L - N + 1:] = np.exp(-0.5j * theta_W * n_sq[1:N][::-1])
+    V = fft.fft(v, overwrite_x=True)
+
+    g_mod = np.exp(0.5j * theta_W * n_sq[:M])
+
+    y_mod, V, g_mod = (arr.astype(dtype, copy=False)
+                       for arr in (y_mod, V, g_mod))
+    for arr in (y_mod, V, g_mod):
+        arr.setflags(write=False)
+    return y_mod, V, g_mod
+
+
 @chk.check(dict(x_FS=chk.accept_any(chk.has_reals, chk.has_complex),
                 T=chk.is_real,
                 a=chk.is_real,
@@ -372,6 +517,7 @@ def fs_interp(x_FS, T, a, b, M, axis=-1, real_x=False):
     :py:class:`~numpy.ndarray`
         (..., M, ...) interpolated values :math:`\left[ x(t[0]), \ldots, x(t[M-1]) \right]` along the axis indicated by `axis`.
         If `real_x` is :py:obj:`True`, the output is real-valued, otherwise it is complex-valued.
+        32-bit inputs yield 32-bit outputs.
 
     Examples
     --------
@@ -461,6 +607,8 @@ def fs_interp(x_FS, T, a, b, M, axis=-1, real_x=False):
     -----
     Theory: :ref:`fp_interp_def`.
 
+    Interpolation is batched over all dimensions other than `axis`: signals sharing (`T`, `a`, `b`, `M`) should be stacked and interpolated in a single call.
+
     See Also
     --------
     :py:class:`~pypeline.util.math.fourier.FFTW_FS_INTERP`
@@ -482,23 +630,72 @@ def fs_interp(x_FS, T, a, b, M, axis=-1, real_x=False):
     sh = [1] * x_FS.ndim
     sh[axis] = M
 
-    A = np.exp(-1j * 2 * np.pi / T * a)
-    W = np.exp(1j * (2 * np.pi / T) * (b - a) / (M - 1))
-    E = np.arange(M)
+    A, W, C = _fs_interp_kernel(N_FS, M, T, a, b, real_x)
+    C = np.reshape(C, sh)
 
     if real_x:  # Real-valued functions.
-        x0_FS = x_FS[array.index(x_FS, axis, slice(N, N + 1))]
-        xp_FS = x_FS[array.index(x_FS, axis, slice(N + 1, N_FS))]
-        C = np.reshape(W ** E, sh) / A
+        idx = [slice(None)] * x_FS.ndim
+        idx[axis] = slice(N, N + 1)
+        x0_FS = x_FS[tuple(idx)]
+        idx[axis] = slice(N + 1, N_FS)
+        xp_FS = x_FS[tuple(idx)]
 
-        x = czt(xp_FS, A, W, M, axis=axis)
-        x *= 2 * C
+        x = _czt(xp_FS, A, W, M, axis)
+        x *= C
         x += x0_FS
         x = x.real
 
     else:  # Complex-valued functions.
-        C = np.reshape(W ** (-N * E), sh) * (A ** N)
-        x = czt(x_FS, A, W, M, axis=axis)
+        x = _czt(x_FS, A, W, M, axis)
         x *= C
 
     return x
+
+
+@functools.lru_cache(maxsize=64)
+def _fs_interp_kernel(N_FS, M, T, a, b, real_x):
+    """
+    Input-independent terms of :py:func:`~pypeline.util.math.fourier.fs_interp`.
+
+    Parameters
+    ----------
+    N_FS : int
+        Number of FS coefficients.
+    M : int
+        Number of points to interpolate.
+    T : float
+        Function period.
+    a : float
+        Interval LHS.
+    b : float
+        Interval RHS.
+    real_x : bool
+        If :py:obj:`True`, return the terms of the real-valued algorithm.
+
+    Returns
+    -------
+    A : complex
+        CZT circular offset.
+    W : complex
+        CZT circular spacing.
+    C : :py:class:`~numpy.ndarray`
+        (M,) modulation applied to the CZT output.
+
+    Notes
+    -----
+    Outputs are cached, hence read-only.
+    """
+    N = (N_FS - 1) // 2
+    theta_A = -(2 * np.pi / T) * a
+    theta_W = (2 * np.pi / T) * (b - a) / (M - 1)
+    A = cmath.exp(1j * theta_A)
+    W = cmath.exp(1j * theta_W)
+    E = np.arange(M)
+
+    if real_x:
+        C = 2 * np.exp(1j * (theta_W * E - theta_A))
+    else:
+        C = np.exp(1j * N * (theta_A - theta_W * E))
+
+    C.setflags(write=False)
+    return A, W, C
@@ -152,8 +152,13 @@ def eigh(A, B=None, tau=1, N=None):
     A = (Vs * Ds) @ Vs.conj().T
 
     # A, B: generalized eigenvalue-decomposition.
+    # If all the energy is kept, only the N leading eigenpairs are required.
+    subset_idx = None
+    if (tau == 1) and (N is not None) and (N < M):
+        subset_idx = [M - N, M - 1]
+
     try:
-        D, V = linalg.eigh(A, B)
+        D, V = linalg.eigh(A, B, subset_by_index=subset_idx)
 
         # Discard near-zero D due to numerical precision.
         idx = D > 0
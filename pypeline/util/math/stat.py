@@ -12,7 +12,6 @@ import astropy.units as u
 import numpy as np
 import scipy.linalg as linalg
 import scipy.special as special
-import scipy.stats as stats
 
 import pypeline.core as core
 import pypeline.util.argcheck as chk
@@ -127,8 +126,9 @@ class Wishart(Distribution):
     """
 
     @chk.check(dict(V=chk.accept_any(chk.has_reals, chk.has_complex),
-                    n=chk.is_integer))
-    def __init__(self, V, n):
+                    n=chk.is_integer,
+                    validate=chk.is_boolean))
+    def __init__(self, V, n, validate=True):
         """
         Parameters
         ----------
@@ -136,13 +136,18 @@ class Wishart(Distribution):
             (p, p) positive-semidefinite Hermitian scale matrix.
         n : int
             degrees of freedom.
+        validate : bool
+            If :py:obj:`False`, skip checking that `V` is Hermitian.
+            `V` must then be Hermitian by construction.
         """
         super().__init__()
 
         V = np.array(V)
         p = len(V)
 
-        if not (chk.has_shape([p, p])(V) and np.allclose(V, V.conj().T)):
+        if not chk.has_shape([p, p])(V):
+            raise ValueError('Parameter[V] must be hermitian symmetric.')
+        if validate and (not np.allclose(V, V.conj().T)):
             raise ValueError('Parameter[V] must be hermitian symmetric.')
         if not (n > p):
             raise ValueError(f'Parameter[n] must be greater than {p}.')
@@ -151,9 +156,16 @@ class Wishart(Distribution):
         self._p = p
         self._n = n
 
-        Vq = linalg.sqrtm(V)
-        _, R = linalg.qr(Vq)
-        self._L = R.conj().T
+        # Square-root factor L such that V = L L^{H}.
+        try:
+            self._L = linalg.cholesky(V, lower=True, check_finite=False)
+        except linalg.LinAlgError:  # V is singular.
+            D, Q = linalg.eigh(V)
+            self._L = Q * np.sqrt(np.clip(D, 0, None))
+
+        # Buffered attributes
+        self._diag_idx = np.diag_indices(p)
+        self._tril_idx = np.tril_indices(p, k=-1)
 
     @property
     def mean(self):
@@ -241,13 +253,14 @@ class Wishart(Distribution):
 
         A = np.zeros((N_sample, self._p, self._p))
 
-        diag_idx = np.diag_indices(self._p)
-        df = (self._n * np.ones((N_sample, 1)) - np.arange(self._p))
-        A[:, diag_idx[0], diag_idx[1]] = np.sqrt(stats.chi2.rvs(df=df))
+        diag_idx = self._diag_idx
+        df = self._n - np.arange(self._p)
+        A[:, diag_idx[0], diag_idx[1]] = np.sqrt(
+            np.random.chisquare(df, size=(N_sample, self._p)))
 
-        tril_idx = np.tril_indices(self._p, k=-1)
+        tril_idx = self._tril_idx
         size = (N_sample, self._p * (self._p - 1) // 2)
-        A[:, tril_idx[0], tril_idx[1]] = stats.norm.rvs(size=size)
+        A[:, tril_idx[0], tril_idx[1]] = np.random.standard_normal(size)
 
         W = self._L @ A
         X = W @ W.conj().transpose(0, 2, 1)